@@ -25,7 +25,6 @@ in pkgs.mkShell rec {
                 urllib3
                 
                 # Fetching supprot
-                requests
                 httpx
                 h2
             ];
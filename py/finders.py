@@ -1,7 +1,17 @@
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 from urllib.parse import urljoin, urlparse
-import urllib.parse
 import logging
+import base64
+import re
+
+
+# Only the tags inspected by the finders below are kept when parsing
+LOGO_STRAINER = SoupStrainer(["img", "a", "div", "span", "svg", "meta"])
+
+# Keyword matchers, compiled once instead of lowercasing and scanning per element
+LOGO_RE = re.compile(r"logo", re.I)
+LOGO_BRAND_RE = re.compile(r"logo|brand", re.I)
+WHITESPACE_RE = re.compile(r"\s+")
 
 
 def make_absolute_url(base_url: str, logo_url: str) -> str:
@@ -9,6 +19,10 @@ def make_absolute_url(base_url: str, logo_url: str) -> str:
     if not logo_url:
         return logo_url
     
+    # Most logo URLs are already absolute, which needs no parsing
+    if logo_url.startswith(("https://", "http://")):
+        return logo_url
+    
     if logo_url.startswith("//"):
         return "https:" + logo_url
     
@@ -18,18 +32,27 @@ def make_absolute_url(base_url: str, logo_url: str) -> str:
     return logo_url
 
 
+def is_logo_svg(svg) -> bool:
+    """Check if SVG element has logo in its class."""
+    return LOGO_RE.search(' '.join(svg.get("class", ()))) is not None
+
+
+def create_svg_data_url(svg) -> str:
+    """Convert SVG element to data URL."""
+    svg_content = WHITESPACE_RE.sub(" ", str(svg)).strip()
+    return f"data:image/svg+xml;base64,{base64.b64encode(svg_content.encode('utf-8')).decode('ascii')}"
+
+
+def has_matching_ancestor(element, names: tuple[str, ...], class_pattern: re.Pattern) -> bool:
+    """Check if any ancestor is one of the given tags with a class matching the pattern."""
+    for parent in element.parents:
+        if parent.name in names and class_pattern.search(' '.join(parent.get("class", ()))):
+            return True
+    return False
+
+
 def find_svg_logos(soup: BeautifulSoup, _: str) -> str | None:
     """Find inline SVG logos and convert to data URLs."""
-    def is_logo_svg(svg) -> bool:
-        """Check if SVG element has logo in its class."""
-        svg_class = ' '.join(svg.get("class", [])).lower()
-        return "logo" in svg_class
-    
-    def create_svg_data_url(svg) -> str:
-        """Convert SVG element to data URL."""
-        svg_content = ' '.join(str(svg).split())
-        return f"data:image/svg+xml,{urllib.parse.quote(svg_content)}"
-    
     def process_container(container) -> str | None:
         """Process a single container for SVG logos."""
         svgs = container.find_all("svg")
@@ -41,7 +64,7 @@ def find_svg_logos(soup: BeautifulSoup, _: str) -> str | None:
         return None
     
     # Look for a and div elements with "logo" in their class
-    logo_containers = soup.find_all(["a", "div"], class_=lambda x: x and "logo" in x.lower())
+    logo_containers = soup.find_all(["a", "div"], class_=LOGO_RE)
     
     for container in logo_containers:
         result = process_container(container)
@@ -58,15 +81,14 @@ def find_navbar_brand_logos(soup: BeautifulSoup, base_url: str) -> str | None:
         """Find logo image within a single link."""
         imgs = link.find_all("img")
         for img in imgs:
-            alt_text = img.get("alt", "").lower()
-            if "logo" in alt_text:
+            if LOGO_RE.search(img.get("alt", "")):
                 src = img.get("data-src") or img.get("src", "")
                 if src:
                     return src
         return None
     
     # Look for a tags with "logo" or "brand" in their class
-    brand_links = soup.find_all("a", class_=lambda x: x and any(word in x.lower() for word in ["logo", "brand"]))
+    brand_links = soup.find_all("a", class_=LOGO_BRAND_RE)
     
     for link in brand_links:
         logo_src = find_logo_in_link(link)
@@ -80,29 +102,18 @@ def find_navbar_brand_logos(soup: BeautifulSoup, base_url: str) -> str | None:
 def find_explicit_logos(soup: BeautifulSoup, base_url: str) -> str | None:
     """Find elements explicitly labeled as logos."""
 
-    def is_logo_img(img) -> bool:
-        """Check if image element is explicitly labeled as a logo."""
+    for img in soup.find_all("img"):
         src = img.get("data-src") or img.get("src", "")
         if not src:
-            return False
+            continue
         
-        element_class = ' '.join(img.get("class", [])).lower()
-        return "logo" in src.lower() or "logo" in element_class
-    
-    def get_logo_src(img) -> str:
-        """Get the source URL from an image element."""
-        return img.get("data-src") or img.get("src", "")
-    
-    for img in soup.find_all("img"):
-        if is_logo_img(img):
-            src = get_logo_src(img)
-            element_class = ' '.join(img.get("class", [])).lower()
-            
-            if "logo" in src.lower():
-                logging.info(f"Found explicit logo: {src} (matched in src URL)")
-            else:
-                logging.info(f"Found explicit logo: {src} (matched in class: '{element_class}')")
-            
+        if LOGO_RE.search(src):
+            logging.info(f"Found explicit logo: {src} (matched in src URL)")
+            return make_absolute_url(base_url, src)
+        
+        element_class = ' '.join(img.get("class", ()))
+        if LOGO_RE.search(element_class):
+            logging.info(f"Found explicit logo: {src} (matched in class: '{element_class}')")
             return make_absolute_url(base_url, src)
     
     return None
@@ -123,27 +134,87 @@ def find_in_meta_tags(soup: BeautifulSoup, base_url: str) -> str | None:
 def find_css_background_logos(soup: BeautifulSoup, _: str) -> str | None:
     """Find logos embedded in CSS background images."""
     # Look for elements with logo-related classes that might have CSS background images
-    logo_selectors = [
+    # A single selector list matches all candidates in one pass over the tree
+    logo_selector = ", ".join([
         "div[class*='logo']",
-        "a[class*='logo']", 
+        "a[class*='logo']",
         "span[class*='logo']",
         "div[id*='logo']",
         "a[id*='logo']"
-    ]
-    
-    for selector in logo_selectors:
-        elements = soup.select(selector)
-        for element in elements:
-            # Check if this element has logo-related classes or IDs
-            element_class = ' '.join(element.get("class", [])).lower()
-            element_id = element.get("id", "").lower()
-            
-            if any(keyword in element_class or keyword in element_id 
-                   for keyword in ["logo", "brand"]):
-                logging.info(f"Found potential CSS logo element: {element.name} with classes: {element_class}")
-                # For now, we can't extract the actual CSS background image from the HTML
-                # But we can return a placeholder indicating we found a CSS logo
-                return "css_background_logo_found"
+    ])
+    
+    for element in soup.select(logo_selector):
+        # Check if this element has logo-related classes or IDs
+        element_class = ' '.join(element.get("class", ()))
+        element_id = element.get("id", "")
+        
+        if LOGO_BRAND_RE.search(element_class) or LOGO_BRAND_RE.search(element_id):
+            logging.info(f"Found potential CSS logo element: {element.name} with classes: {element_class}")
+            # For now, we can't extract the actual CSS background image from the HTML
+            # But we can return a placeholder indicating we found a CSS logo
+            return "css_background_logo_found"
+    
+    return None
+
+
+def find_logo_fused(soup: BeautifulSoup, base_url: str) -> str | None:
+    """Run every finder in a single pass over the tree, returning the result in ALL_FINDERS priority order."""
+    # One (src, class, alt, tag) row per image with a source, built once and shared by the image rules
+    img_index: list[tuple[str, str, str, Tag]] = []
+    meta_tag = None
+    css_element = None
+    
+    for element in soup.descendants:
+        if not isinstance(element, Tag):
+            continue
+        name = element.name
+        
+        if name == "svg":
+            # Highest priority, so the walk can stop at the first match
+            if is_logo_svg(element) and has_matching_ancestor(element, ("a", "div"), LOGO_RE):
+                data_url = create_svg_data_url(element)
+                logging.info(f"Found SVG logo: {data_url[:100]}... (matched pattern: container with logo class + svg with logo class)")
+                return data_url
+        
+        elif name == "img":
+            src = element.get("data-src") or element.get("src", "")
+            if src:
+                img_index.append((src, ' '.join(element.get("class", ())), element.get("alt", ""), element))
+        
+        elif name == "meta":
+            # Like find_in_meta_tags, only the first og:image tag is considered.
+            # og:image ranks below the in-page rules, so it cannot short-circuit the parse
+            if meta_tag is None and element.get("property") == "og:image":
+                meta_tag = element
+        
+        if css_element is None and name in ("div", "a", "span"):
+            element_class = ' '.join(element.get("class", ()))
+            element_id = element.get("id", "") if name != "span" else ""
+            if "logo" in element_class or "logo" in element_id:
+                css_element = element
+    
+    for src, _, alt, img in img_index:
+        if LOGO_RE.search(alt) and has_matching_ancestor(img, ("a",), LOGO_BRAND_RE):
+            logging.info(f"Found navbar brand logo: {src} (matched pattern: a with logo/brand class + img with logo in alt)")
+            return make_absolute_url(base_url, src)
+    
+    for src, element_class, _, _ in img_index:
+        if LOGO_RE.search(src):
+            logging.info(f"Found explicit logo: {src} (matched in src URL)")
+            return make_absolute_url(base_url, src)
+        if LOGO_RE.search(element_class):
+            logging.info(f"Found explicit logo: {src} (matched in class: '{element_class}')")
+            return make_absolute_url(base_url, src)
+    
+    if meta_tag is not None and meta_tag.get("content"):
+        url = make_absolute_url(base_url, meta_tag["content"])
+        if urlparse(url).scheme in ["http", "https"]:
+            logging.info(f"Found logo in meta tags: {url} (matched property: 'og:image')")
+            return url
+    
+    if css_element is not None:
+        logging.info(f"Found potential CSS logo element: {css_element.name} with classes: {' '.join(css_element.get('class', ()))}")
+        return "css_background_logo_found"
     
     return None
 
@@ -156,3 +227,9 @@ ALL_FINDERS = [
     find_in_meta_tags,
     find_css_background_logos,
 ]
+
+# Single-pass equivalent of ALL_FINDERS, used by the crawler by default.
+# Rules added to ALL_FINDERS must also be added to find_logo_fused (checked by test_finders.py)
+FUSED_FINDERS = [
+    find_logo_fused,
+]
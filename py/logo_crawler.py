@@ -1,40 +1,28 @@
 import sys
 import csv
 import logging
-import requests
+import argparse
+import asyncio
+import httpx
 from bs4 import BeautifulSoup
-from finders import ALL_FINDERS
-from strategies import ALL_STRATEGIES
+from finders import ALL_FINDERS, FUSED_FINDERS, LOGO_STRAINER
+from strategies import ALL_STRATEGIES, DNS_FAILURE, create_client
 
 LOGO_NOT_FOUND = "logo_not_found"
 REQUEST_FAILED = "request_failed"
 NOT_WORKING_SITE = "not_working_site"
 
-CONNECTIVITY_TIMEOUT = 10
+DEFAULT_CONCURRENCY = 64
+OUTPUT_BATCH_SIZE = 256
 
 
-def check_site_connectivity(url: str) -> str | None:
-    """Check if a site is reachable (DNS resolution, basic connectivity)."""
+def parse_html(content: bytes, encoding: str | None = None) -> BeautifulSoup:
+    """Parse only the tags the finders need, with lxml and a stdlib parser fallback."""
     try:
-        requests.get(url, timeout=CONNECTIVITY_TIMEOUT, allow_redirects=True)
-        return None
-        
-    except requests.exceptions.ConnectionError as e:
-        error_str = str(e).lower()
-        dns_errors = [
-            "could not resolve host",
-            "name or service not known", 
-            "name resolution failed"
-        ]
-        
-        if any(dns_error in error_str for dns_error in dns_errors):
-            logging.info(f"Site appears non-functional (DNS resolution failure): {e}")
-            return NOT_WORKING_SITE
-        
-        return None
-        
+        return BeautifulSoup(content, "lxml", parse_only=LOGO_STRAINER, from_encoding=encoding)
     except Exception as e:
-        return None
+        logging.warning(f"lxml parser failed, falling back to html.parser: {type(e).__name__}: {e}")
+        return BeautifulSoup(content, "html.parser", parse_only=LOGO_STRAINER, from_encoding=encoding)
 
 
 def find_first_logo(soup: BeautifulSoup, final_url: str, finders: list) -> str | None:
@@ -45,27 +33,40 @@ def find_first_logo(soup: BeautifulSoup, final_url: str, finders: list) -> str |
     return next((url for url in logo_urls if url), None)
 
 
-def process_strategy(strategy_name: str, strategy_func, url: str, finders: list) -> str | None:
+def find_logo_in_content(content: bytes, final_url: str, finders: list, encoding: str | None = None) -> str | None:
+    """Parse a page and run the finders on it."""
+    soup = parse_html(content, encoding)
+    return find_first_logo(soup, final_url, finders)
+
+
+async def process_strategy(client: httpx.AsyncClient, strategy_name: str, strategy_func, url: str, finders: list) -> str | None:
     """Process a single strategy and return logo if found."""
     try:
         logging.info(f"Trying strategy: {strategy_name}")
-        success, content, final_url = strategy_func(url)
+        success, content, final_url, encoding = await strategy_func(client, url)
+        
+        if not success and final_url == DNS_FAILURE:
+            logging.info(f"Site appears non-functional (DNS resolution failure): {url}")
+            return NOT_WORKING_SITE
         
         if not success or not content:
             return None
         
-        soup = BeautifulSoup(content, "html.parser")
-        return find_first_logo(soup, final_url, finders)
+        # Parsing is CPU bound, so it runs in a worker thread to keep the event loop serving I/O
+        return await asyncio.to_thread(find_logo_in_content, content, final_url, finders, encoding)
         
     except Exception as e:
         logging.error(f"Strategy '{strategy_name}' failed: {type(e).__name__}: {e}")
         return None
 
 
-def get_logo_with_strategies(url: str, strategies: list, finders: list) -> str:
+async def get_logo_with_strategies(client: httpx.AsyncClient, url: str, strategies: list, finders: list) -> str:
     """Attempts to find a logo for a given URL using a list of strategies."""
     for strategy_name, strategy_func in strategies:
-        logo_url = process_strategy(strategy_name, strategy_func, url, finders)
+        logo_url = await process_strategy(client, strategy_name, strategy_func, url, finders)
+        if logo_url == NOT_WORKING_SITE:
+            # No other strategy can reach a host that does not resolve
+            return NOT_WORKING_SITE
         if logo_url:
             logging.info(f"Logo found using {strategy_name}: {logo_url}")
             return logo_url
@@ -82,25 +83,40 @@ def generate_domain_urls(domain: str) -> list[str]:
     ]
 
 
-def get_logo_for_domain(domain: str, strategies: list, finders: list) -> str:
-    """Tries to find a logo by checking multiple common URL patterns."""
+async def get_logo_for_domain(client: httpx.AsyncClient, domain: str, strategies: list, finders: list) -> str:
+    """Tries to find a logo by checking multiple common URL patterns concurrently."""
     domain = domain.strip()
+    urls_to_try = generate_domain_urls(domain)
+    
+    # All URLs are probed at once, but results are consumed in priority order
+    # so a lower priority page never wins over one that is still loading
+    tasks = [
+        asyncio.create_task(get_logo_with_strategies(client, url, strategies, finders))
+        for url in urls_to_try
+    ]
     
-    for url in generate_domain_urls(domain):
-        result = get_logo_with_strategies(url, strategies, finders)
-        if result and result not in [LOGO_NOT_FOUND, REQUEST_FAILED]:
-            return result
+    try:
+        for url, task in zip(urls_to_try, tasks):
+            result = await task
+            if result == NOT_WORKING_SITE:
+                # Only an unresolvable root domain marks the whole site as not working
+                if url == urls_to_try[0]:
+                    return NOT_WORKING_SITE
+                continue
+            if result and result not in [LOGO_NOT_FOUND, REQUEST_FAILED]:
+                return result
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Let cancelled probes unwind before the shared client can be closed
+        await asyncio.gather(*tasks, return_exceptions=True)
 
     return LOGO_NOT_FOUND
 
 
-def process_domain(domain: str) -> str:
+async def process_domain(client: httpx.AsyncClient, domain: str, finders: list) -> str:
     """Process a single domain and return the result string."""
-    connectivity_result = check_site_connectivity(f"https://{domain}")
-    if connectivity_result == NOT_WORKING_SITE:
-        return NOT_WORKING_SITE
-    
-    return get_logo_for_domain(domain, ALL_STRATEGIES, ALL_FINDERS)
+    return await get_logo_for_domain(client, domain, ALL_STRATEGIES, finders)
 
 
 def print_summary(total_success: int, total_failed_or_not_found: int, total_not_working_sites: int):
@@ -108,25 +124,43 @@ def print_summary(total_success: int, total_failed_or_not_found: int, total_not_
     print(f"SUMMARY: success={total_success}, failed_or_not_found={total_failed_or_not_found}, not_working_sites={total_not_working_sites}", file=sys.stderr)
 
 
-def main():
-    """Main function to read domains from STDIN and write CSV to STDOUT."""
-    logging.basicConfig(
-        level=logging.CRITICAL, format="%(levelname)s: %(message)s", stream=sys.stderr
-        # level=logging.INFO, format="%(levelname)s: %(message)s", stream=sys.stderr
-    )
-    
-    writer = csv.writer(sys.stdout)
-    writer.writerow(["domain", "logo_url"])
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Crawl domains from STDIN and write their logo URLs as CSV to STDOUT.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_CONCURRENCY, help=f"maximum number of domains processed concurrently (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--reference-finders", action="store_true", help="run each finder separately (ALL_FINDERS) instead of the single-pass fused finder")
+    return parser.parse_args()
+
+
+async def amain(domains: list[str], concurrency: int, writer, finders: list = FUSED_FINDERS):
+    """Process all domains over a shared HTTP client and write CSV rows in input order."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
 
-    total_success = 0
-    total_failed_or_not_found = 0
-    total_not_working_sites = 0
+    async with create_client() as client:
 
-    for line in sys.stdin:
-        domain = line.strip()
-        if domain:
-            result = process_domain(domain)
-            writer.writerow([domain, result])
+        async def process_domain_bounded(domain: str) -> str:
+            async with semaphore:
+                return await process_domain(client, domain, finders)
+
+        # Repeated domains share one task, so each distinct domain is crawled once
+        tasks_by_domain: dict[str, asyncio.Task] = {}
+        for domain in domains:
+            key = domain.lower()
+            if key not in tasks_by_domain:
+                tasks_by_domain[key] = asyncio.create_task(process_domain_bounded(domain))
+
+        total_success = 0
+        total_failed_or_not_found = 0
+        total_not_working_sites = 0
+
+        # Rows are written in batches to keep output syscalls off the per-domain path
+        rows = []
+        for domain in domains:
+            result = await tasks_by_domain[domain.lower()]
+            rows.append([domain, result])
+            if len(rows) >= OUTPUT_BATCH_SIZE:
+                writer.writerows(rows)
+                rows.clear()
             
             if result == NOT_WORKING_SITE:
                 total_not_working_sites += 1
@@ -135,8 +169,29 @@ def main():
             else:
                 total_success += 1
 
+        writer.writerows(rows)
+
     # print_summary(total_success, total_failed_or_not_found, total_not_working_sites)
 
 
+def main():
+    """Main function to read domains from STDIN and write CSV to STDOUT."""
+    args = parse_args()
+    logging.basicConfig(
+        level=logging.CRITICAL, format="%(levelname)s: %(message)s", stream=sys.stderr
+        # level=logging.INFO, format="%(levelname)s: %(message)s", stream=sys.stderr
+    )
+    
+    # Block-buffer STDOUT so rows are flushed in chunks rather than per line
+    sys.stdout.reconfigure(line_buffering=False, write_through=False, newline="")
+    writer = csv.writer(sys.stdout)
+    writer.writerow(["domain", "logo_url"])
+
+    domains = [line.strip() for line in sys.stdin if line.strip()]
+    finders = ALL_FINDERS if args.reference_finders else FUSED_FINDERS
+    asyncio.run(amain(domains, args.workers, writer, finders))
+    sys.stdout.flush()
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,68 +1,139 @@
 import httpx
-import requests
+import socket
 import logging
+import re
 
 HTTP2_TIMEOUT = 10.0
 HTTP2_CONNECT_TIMEOUT = 5.0
 FALLBACK_CONNECT_TIMEOUT = 5
 FALLBACK_READ_TIMEOUT = 15
-ERROR_CONTENT_PREVIEW_LENGTH = 500
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 50
 
+# Logos live in <head> or early in the page, so bodies are only read this far
+MAX_BODY_BYTES = 512 * 1024
+BODY_BYTES_AFTER_HEAD = 200 * 1024
+HEAD_END_RE = re.compile(rb"</head\s*>", re.I)
 
-def fetch_with_http2(url: str) -> tuple[bool, str | None, str | None]:
+# Returned in place of the final URL when the host does not resolve
+DNS_FAILURE = "dns_failure"
+DNS_ERROR_MESSAGES = [
+    "could not resolve host",
+    "name or service not known",
+    "name resolution failed",
+]
+DNS_NOT_FOUND_ERRNOS = {socket.EAI_NONAME, getattr(socket, "EAI_NODATA", None)} - {None}
+
+BROWSER_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br",
+    "DNT": "1",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+    "Sec-Fetch-Dest": "document",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-Site": "none",
+    "Sec-Fetch-User": "?1",
+    "sec-ch-ua": '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
+    "sec-ch-ua-mobile": "?0",
+    "sec-ch-ua-platform": '"Linux"',
+    "Cache-Control": "max-age=0",
+}
+
+
+def create_client() -> httpx.AsyncClient:
+    """Create the HTTP client shared by all strategies, so connections are reused across requests."""
+    return httpx.AsyncClient(
+        http2=True,
+        # No pool timeout: the crawler's semaphore bounds concurrency, and waiting for a free
+        # connection under the 3-URL fan-out must not fail the request
+        timeout=httpx.Timeout(HTTP2_TIMEOUT, connect=HTTP2_CONNECT_TIMEOUT, pool=None),
+        limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS),
+        follow_redirects=True
+    )
+
+
+def is_dns_failure(error: Exception) -> bool:
+    """Check if a request failed because the host name could not be resolved."""
+    if not isinstance(error, httpx.ConnectError):
+        return False
+    
+    # Only "host does not exist" counts; temporary resolver errors (EAI_AGAIN) may succeed on retry
+    cause = error
+    while cause is not None:
+        if isinstance(cause, socket.gaierror) and cause.errno in DNS_NOT_FOUND_ERRNOS:
+            return True
+        cause = cause.__cause__ or cause.__context__
+    
+    error_str = str(error).lower()
+    return any(dns_error in error_str for dns_error in DNS_ERROR_MESSAGES)
+
+
+async def read_capped_body(response: httpx.Response) -> bytes:
+    """Stream the response body, stopping once enough of the page for logo detection has arrived."""
+    buffer = bytearray()
+    head_end = None
+    
+    async for chunk in response.aiter_bytes():
+        # Rescan a few bytes of the previous chunk in case </head> was split
+        search_from = max(0, len(buffer) - 8)
+        buffer += chunk
+        
+        if head_end is None:
+            match = HEAD_END_RE.search(buffer, search_from)
+            if match:
+                head_end = match.end()
+        
+        if len(buffer) >= MAX_BODY_BYTES:
+            break
+        if head_end is not None and len(buffer) - head_end >= BODY_BYTES_AFTER_HEAD:
+            break
+    
+    return bytes(buffer[:MAX_BODY_BYTES])
+
+
+async def fetch_with_http2(client: httpx.AsyncClient, url: str) -> tuple[bool, bytes | None, str | None, str | None]:
     """Strategy: HTTP/2 with browser simulation (covers both HTTP/2 and HTTP/1.1)."""
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Accept-Encoding": "gzip, deflate, br",
-            "DNT": "1",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1",
-            "Sec-Fetch-Dest": "document",
-            "Sec-Fetch-Mode": "navigate",
-            "Sec-Fetch-Site": "none",
-            "Sec-Fetch-User": "?1",
-            "sec-ch-ua": '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
-            "sec-ch-ua-mobile": "?0",
-            "sec-ch-ua-platform": '"Linux"',
-            "Cache-Control": "max-age=0",
-        }
-        
-        # HTTP/2 request with automatic fallback to HTTP/1.1
-        with httpx.Client(
-            http2=True,
-            timeout=httpx.Timeout(HTTP2_TIMEOUT, connect=HTTP2_CONNECT_TIMEOUT),
-            follow_redirects=True,
-            headers=headers
-        ) as client:
-            response = client.get(url)
+        # HTTP/2 request with automatic fallback to HTTP/1.1, over the shared connection pool
+        async with client.stream("GET", url, headers=BROWSER_HEADERS) as response:
+            # Error pages are rejected before any of the body is downloaded
             response.raise_for_status()
-            
-            logging.info(f"HTTP/2 Strategy: Status {response.status_code}, Size {len(response.content)} bytes")
-            return True, response.text, str(response.url)
+            body = await read_capped_body(response)
+        
+        # Raw bytes go straight to the parser, along with the charset from the Content-Type header
+        logging.info(f"HTTP/2 Strategy: Status {response.status_code}, Size {len(body)} bytes")
+        return True, body, str(response.url), response.charset_encoding
             
     except Exception as e:
         logging.error(f"HTTP/2 Strategy failed: {type(e).__name__}: {e}")
-        return False, None, None
+        if is_dns_failure(e):
+            return False, None, DNS_FAILURE, None
+        return False, None, None, None
 
 
-def fetch_without_headers(url: str) -> tuple[bool, str | None, str | None]:
-    """Strategy: Try without any headers (for sites that reject all headers)."""
+async def fetch_without_headers(client: httpx.AsyncClient, url: str) -> tuple[bool, bytes | None, str | None, str | None]:
+    """Strategy: Try without any browser headers (for sites that reject them)."""
     try:
-        response = requests.get(url, timeout=(FALLBACK_CONNECT_TIMEOUT, FALLBACK_READ_TIMEOUT), allow_redirects=True)
-        logging.info(f"No headers strategy: Status {response.status_code}, Size {len(response.content)} bytes")
+        async with client.stream(
+            "GET",
+            url,
+            timeout=httpx.Timeout(FALLBACK_READ_TIMEOUT, connect=FALLBACK_CONNECT_TIMEOUT, pool=None)
+        ) as response:
+            logging.info(f"No headers strategy: Status {response.status_code}")
+            response.raise_for_status()
+            body = await read_capped_body(response)
         
-        response.raise_for_status()
-        return True, response.text, response.url
+        logging.info(f"No headers strategy: Size {len(body)} bytes")
+        return True, body, str(response.url), response.charset_encoding
         
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         logging.error(f"No headers strategy failed: {type(e).__name__}: {e}")
-        if hasattr(e, 'response') and e.response is not None:
+        if isinstance(e, httpx.HTTPStatusError):
             logging.error(f"Error response status: {e.response.status_code}")
-            logging.error(f"Error response content preview: {e.response.text[:ERROR_CONTENT_PREVIEW_LENGTH]}")
-        return False, None, None
+        return False, None, None, None
 
 
 # Strategies in priority order
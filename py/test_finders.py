@@ -0,0 +1,61 @@
+import unittest
+
+from finders import ALL_FINDERS, FUSED_FINDERS
+from logo_crawler import find_logo_in_content
+
+BASE_URL = "https://example.com/"
+
+PAGES = {
+    "svg_logo": b"""<html><body>
+        <img src="/img/logo.png">
+        <div class="site-Logo"><a href="/"><svg class="logo-mark"><path d="M0 0"/></svg></a></div>
+    </body></html>""",
+    "svg_without_logo_container": b"""<html><body>
+        <section><svg class="logo"><path d="M0 0"/></svg></section>
+        <img class="header-logo" src="/header.png">
+    </body></html>""",
+    "navbar_brand": b"""<html><body>
+        <img src="/img/logo-footer.png">
+        <a class="navbar-brand" href="/"><img alt="Company Logo" data-src="//cdn.example.com/brand.png"></a>
+    </body></html>""",
+    "explicit_class": b"""<html><body>
+        <img src="/hero.png"><img class="main-LOGO" src="/main.png">
+    </body></html>""",
+    "meta_og_image": b"""<html><head><meta property="og:image" content="/og.png"></head>
+        <body><img src="/hero.png"></body></html>""",
+    "meta_invalid_scheme": b"""<html><head><meta property="og:image" content="javascript:void(0)"></head>
+        <body><span class="logo-bg"></span></body></html>""",
+    "css_background": b"""<html><body><div id="logo"></div></body></html>""",
+    "no_logo": b"""<html><body><p>Nothing to see</p><img src="/hero.png" alt="hero"></body></html>""",
+}
+
+
+class FusedFinderTest(unittest.TestCase):
+
+    def test_fused_finder_matches_reference_finders(self):
+        for name, content in PAGES.items():
+            with self.subTest(page=name):
+                reference = find_logo_in_content(content, BASE_URL, ALL_FINDERS)
+                fused = find_logo_in_content(content, BASE_URL, FUSED_FINDERS)
+                self.assertEqual(fused, reference)
+
+    def test_fixture_pages_cover_each_finder(self):
+        expected = {
+            "navbar_brand": "https://cdn.example.com/brand.png",
+            "explicit_class": "https://example.com/main.png",
+            "meta_og_image": "https://example.com/og.png",
+            "meta_invalid_scheme": "css_background_logo_found",
+            "css_background": "css_background_logo_found",
+            "no_logo": None,
+            "svg_without_logo_container": "https://example.com/header.png",
+        }
+        for name, logo in expected.items():
+            with self.subTest(page=name):
+                self.assertEqual(find_logo_in_content(PAGES[name], BASE_URL, FUSED_FINDERS), logo)
+        
+        svg_logo = find_logo_in_content(PAGES["svg_logo"], BASE_URL, FUSED_FINDERS)
+        self.assertTrue(svg_logo.startswith("data:image/svg+xml;base64,"))
+
+
+if __name__ == "__main__":
+    unittest.main()